@@ -1,18 +1,46 @@
 #!/usr/bin/env python
 # coding: utf-8
 
-import random
-import pandas as pd
 import json
+import os
+import re
+import stat
+import tempfile
 import tkinter as tk
 from tkinter import ttk
-from typing import Tuple
+from typing import Dict, List, Tuple
 import numpy as np
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    import pyarrow.feather as feather
+except ImportError:
+    # Without PyArrow the unit CSV is read with pandas, and isn't cached
+    pa = None
+    import pandas as pd
+
+try:
+    from numba import njit, prange
+    numba_available = True
+except ImportError:
+    # Numba is optional, without it the compiled functions run as plain Python
+    def njit(*args, **kwargs):
+        return lambda func: func
+    prange = range
+    numba_available = False
+
+# Fewest teams for which batch generation uses the parallel Numba function. Compiling it takes seconds,
+# and the first call in each process still has to load it, so smaller batches use the NumPy steps.
+NUMBA_BATCH_MIN_TEAMS = 100_000
+
 # Load configuration from the Config File
 with open('Config.json', 'r') as f:
     config = json.load(f)
 
+# Copy of the configuration as it is in the Config File, to skip saving when nothing changed
+saved_config = dict(config)
+
 # Retrieve configuration values
 hobbit_fill = config['hobbit_fill_team']
 hobbit_team_chance = config['full_hobbit_team_chance']
@@ -24,12 +52,97 @@ app_width = config["width"]
 app_height = config["height"]
 app_mode = config["application_mode"]
 
-# Read unit data from a CSV file
-unit_df = pd.read_csv('Units.csv')
+
+def get_unit_key(name: str, faction: str) -> str:
+    """
+    Formats a string containing the units name, then the faction they belong to in brackets.
+    
+    Args:
+        name (str): Name of the unit
+        faction (str): Faction name the unit belongs to
+    
+    Returns:
+        str: combination of name and faction
+    """
+    return f"{name} ({faction})"
+
+
+# Columns of the unit CSV that are used
+UNIT_COLUMNS = ['Name', 'Faction', 'Cost', 'Ranking']
+
+
+def _load_units(csv_path: str = 'Units.csv', cache_path: str = 'Units.feather') -> Dict[str, np.ndarray]:
+    """
+    Reads the used columns of the unit data.
+    The parsed table is cached as a feather file, along with a JSON stamp of the CSV modification time
+    and the columns read. The cache is used while the stamp still matches, otherwise the CSV is parsed again.
+    If PyArrow isn't installed the CSV is read with pandas every time.
+
+    Args:
+        csv_path (str): Path of the unit CSV file
+        cache_path (str): Path of the feather cache
+
+    Returns:
+        dict: Array of each column in UNIT_COLUMNS
+    """
+    if pa is None:
+        unit_df = pd.read_csv(csv_path, usecols=UNIT_COLUMNS)
+        return {column: unit_df[column].to_numpy() for column in UNIT_COLUMNS}
+
+    table = None
+    stamp_path = cache_path + '.json'
+    stamp = {'mtime': os.path.getmtime(csv_path), 'columns': UNIT_COLUMNS}
+    try:
+        with open(stamp_path, 'r') as f:
+            if json.load(f) == stamp:
+                table = feather.read_table(cache_path)
+    except (OSError, ValueError, pa.ArrowInvalid):
+        pass
+    # A cache missing any of the columns is treated as out of date
+    if table is not None and not set(UNIT_COLUMNS).issubset(table.column_names):
+        table = None
+
+    if table is None:
+        table = pacsv.read_csv(csv_path, convert_options=pacsv.ConvertOptions(include_columns=UNIT_COLUMNS))
+        # Not being able to write the cache only means the CSV is parsed again next time
+        try:
+            feather.write_feather(table, cache_path)
+            with open(stamp_path, 'w') as f:
+                json.dump(stamp, f)
+        except OSError:
+            pass
+
+    return {column: table[column].to_numpy() for column in UNIT_COLUMNS}
+
+
+# Read the unit data
+unit_columns = _load_units()
+UNIT_NAMES = unit_columns['Name']
+UNIT_FACTIONS = unit_columns['Faction']
+UNIT_COSTS = unit_columns['Cost'].astype(np.int64)
+UNIT_RANK = unit_columns['Ranking']
+del unit_columns
+
+# Display name of each unit, and of the hobbits used to fill a team
+UNIT_KEYS = np.array([get_unit_key(name, faction) for name, faction in zip(UNIT_NAMES, UNIT_FACTIONS)], dtype=object)
+HOBBIT_KEY = get_unit_key("Hobbit", "Farmer")
+
+# Indices of the units at or above each difficulty level, ordered from cheapest to most expensive
+COST_ORDER = np.argsort(UNIT_COSTS, kind='stable')
+DIFF_INDEX = {d: COST_ORDER[UNIT_RANK[COST_ORDER] >= d] for d in range(5)}
+
+# Shared random generator, seeded from the OS, that all random draws come from
+RNG = np.random.default_rng()
 
 # Flag for when the application is closing
 closing = False
 
+# Pending Tk after callback for saving the window size, so a resize is only saved once it ends
+resize_after_id = None
+
+# Name of the ttk theme used for the generated teams notebook
+NOTEBOOK_STYLE_NAME = 'CustomNotebook'
+
 # Define color schemes for dark mode and light mode
 dark_mode_colours = {
     'background': '#2d2d2d',
@@ -103,97 +216,307 @@ class RandomTabsTeam:
 
     Attributes:
         budget (int): Integer for the amount of money the generator has to spend
-        selection_df (pd.Dataframe): Dataframe of units to select from
+        keys (np.ndarray): Display names of the units to select from, ordered by cost
+        costs (np.ndarray): Costs of the units to select from, sorted from cheapest to most expensive
         hobbit_fill (bool): Boolean value for if the remaining money gets spent on hobbits
         hobbit_team_chance (int): a 1 out of integer chance of the team just being hobbits
         max_unit_width (int): the max size of distinct units in the team 
+        rng (np.random.Generator): Random generator used for every draw of the team
+        generate (bool): Boolean value for if the team is generated on creation
     """
     def __init__(
             self, 
             budget: int, 
-            selection_df: pd.DataFrame, 
+            keys: np.ndarray, 
+            costs: np.ndarray, 
             hobbit_fill: bool, 
             hobbit_team_chance: int,
             max_unit_width: int,
+            rng: np.random.Generator = RNG,
+            generate: bool = True,
         ) -> None:
         self.budget = budget
         self.cost = 0
-        self.team = {}
-        self.unit_df = selection_df
+        self.hobbit_count = 0
         self.hobbit_fill = hobbit_fill
         self.hob_chance = hobbit_team_chance
         self.max_unit_width = max_unit_width
+        self.rng = rng
+
+        # Column arrays of the selection sorted by cost, so the affordable units are always a prefix
+        self._costs_sorted = costs
+        self._keys_sorted = keys
+
+        # Count of each selected unit in the team, in the same order as the sorted arrays
+        self.team_counts = np.zeros(self._costs_sorted.size, dtype=np.int64)
+
+        if generate:
+            self.generate_team()
+
+    @classmethod
+    def generate_batch(
+            cls,
+            teams_created: int,
+            budget: int,
+            keys: np.ndarray,
+            costs: np.ndarray,
+            hobbit_fill: bool,
+            hobbit_team_chance: int,
+            max_unit_width: int,
+            rng: np.random.Generator = RNG,
+        ) -> List["RandomTabsTeam"]:
+        """
+        Generates several teams at once, with every team simulated together by simulate_teams.
+
+        Args:
+            teams_created (int): The number of teams to generate
+            The remaining arguments are the same as for creating a single team
+
+        Returns:
+            list: The generated teams
+        """
+        teams = [
+            cls(budget, keys, costs, hobbit_fill, hobbit_team_chance, max_unit_width, rng, generate=False)
+            for _ in range(teams_created)
+        ]
+        counts, budgets = simulate_teams(costs, budget, hobbit_team_chance, max_unit_width, teams_created, rng)
+        for team, team_counts, remaining in zip(teams, counts, budgets):
+            team.add_unit_counts(team_counts, budget - int(remaining))
+            team.hobbit_fill_remaining()
 
-        self.generate_team()
+        return teams
 
     def __str__(self) -> str:
-        formatted_team = [f"{key} x {value}" for key, value in self.team.items()]
+        formatted_team = [
+            f"{self._keys_sorted[i]} x {self.team_counts[i]}"
+            for i in np.flatnonzero(self.team_counts)
+        ]
+        if self.hobbit_count:
+            formatted_team.append(f"{HOBBIT_KEY} x {self.hobbit_count}")
+        formatted_team.append(f"Total Cost: {self.cost}")
 
         # Returns a string for the number of each unit, and a total cost at the end.
-        return "\n".join(formatted_team) + f"\nTotal Cost: {self.cost}"
+        return "\n".join(formatted_team)
     
     def generate_team(self) -> None:
         """
         Checks if the team is all hobbits, otherwise loops through the max_unit_width and adds random units, subtracting the cost from the budget.
         """
-        if random.randint(1, self.hob_chance) == 1:
-            self.hobbit_fill_remaining()
-            return
-            
-        for _ in range(self.max_unit_width):
-            if self.budget < self.unit_df['Cost'].min():
-                break
-            self.filter_df_cost()
-            name, faction, unit_cost = self.random_unit()
-            total_units = random.randint(1, np.floor(self.budget/unit_cost))
-            key = self.get_unit_key(name, faction)
-            self.team[key] = self.team.get(key, 0) + total_units
-            self.budget -= total_units * unit_cost
-            self.cost += total_units * unit_cost
+        active, unit_rand, count_rand = draw_team_randoms(self.rng, 1, self.hob_chance, self.max_unit_width)
+        if active[0]:
+            counts, spent = _simulate_team(self._costs_sorted, self.budget, unit_rand[0], count_rand[0])
+            self.add_unit_counts(counts, spent)
 
         self.hobbit_fill_remaining()
 
-    def get_unit_key(self, name: str, faction: str) -> str:
+    def add_unit_counts(self, counts: np.ndarray, spent: int) -> None:
         """
-        Formats a string containing the units name, then the faction they belong to in brackets.
-        
+        Adds the units picked by a simulation to the team, and takes their cost from the budget.
+
         Args:
-            name (str): Name of the unit
-            faction (str): Faction name the unit belongs to
-        
-        Returns:
-            str: combination of name and faction
+            counts (np.ndarray): Count of each unit, in the cost sorted order of the selection
+            spent (int): The total cost of the units
         """
-        return f"{name} ({faction})"
+        self.team_counts += counts
+        self.budget -= spent
+        self.cost += spent
 
-    def random_unit(self) -> Tuple[str, str, int]:
+    def hobbit_fill_remaining(self) -> None:
         """
-        Provides a random unit from the Dataframe.
-        
-        Returns:
-            str: The unit's name
-            str: The unit's faction
-            int: The cost of the unit
+        Spends the remaining budget on as many hobbits as it can afford.
         """
-        random_row = self.unit_df.sample(n=1)
-        unit_name = random_row.iloc[0]['Name']
-        unit_faction = random_row.iloc[0]['Faction']
-        unit_cost = random_row.iloc[0]['Cost']
+        value = self.budget // 50
+        self.hobbit_count += value
+        self.cost += value * 50
 
-        return unit_name, unit_faction, unit_cost
 
-    def filter_df_cost(self) -> None:
-        """
-        Filters the unit Dataframe to only contain units that have a cost less than the current budget.
-        """
-        self.unit_df = self.unit_df[self.unit_df["Cost"] <= self.budget]
+def draw_team_randoms(
+        rng: np.random.Generator,
+        teams_created: int,
+        hobbit_team_chance: int,
+        max_unit_width: int,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Draws every random number needed to generate teams, in one batch per kind of draw.
 
-    def hobbit_fill_remaining(self) -> None:
-        if self.budget > 50:
-            value = int(np.floor(self.budget/50))
-            key = self.get_unit_key("Hobbit", "Farmer")
-            self.team[key] = self.team.get(key, 0) + value
-            self.cost += value * 50
+    Args:
+        rng (np.random.Generator): Random generator to draw from
+        teams_created (int): The number of teams to draw for
+        hobbit_team_chance (int): a 1 out of integer chance of a team just being hobbits
+        max_unit_width (int): the max size of distinct units in a team
+
+    Returns:
+        np.ndarray: Boolean value per team for if it picks units, False for hobbit only teams
+        np.ndarray: Random non-negative integers used to pick each unit, one row per team
+        np.ndarray: Random floats in [0, 1) used to pick how many of each unit, one row per team
+    """
+    active = rng.integers(1, hobbit_team_chance + 1, size=teams_created) != 1
+    unit_rand = rng.integers(0, 2**31, size=(teams_created, max_unit_width))
+    count_rand = rng.random((teams_created, max_unit_width))
+
+    return active, unit_rand, count_rand
+
+
+@njit(cache=True)
+def _simulate_team_into(
+        costs_sorted: np.ndarray,
+        budget: int,
+        unit_rand: np.ndarray,
+        count_rand: np.ndarray,
+        counts: np.ndarray,
+    ) -> int:
+    """
+    Runs the unit selection of a single team, adding the picked units to counts.
+    This is compiled with Numba when it is installed, so it only takes numbers and arrays,
+    with the names being looked up afterwards. The counts array is provided by the caller,
+    so a batch can write each team straight into its row.
+    The random draws are made beforehand, one of each per distinct unit slot.
+
+    Args:
+        costs_sorted (np.ndarray): Unit costs sorted from cheapest to most expensive
+        budget (int): The amount of money the team has to spend
+        unit_rand (np.ndarray): Random non-negative integers used to pick each unit
+        count_rand (np.ndarray): Random floats in [0, 1) used to pick how many of each unit
+        counts (np.ndarray): Count of each unit in the team, added to in place
+
+    Returns:
+        int: The total cost of the units
+    """
+    spent = 0
+    # Numba doesn't bounds check, so an empty selection has to return before costs_sorted[0] is read
+    if costs_sorted.size == 0:
+        return spent
+
+    for j in range(unit_rand.size):
+        if budget < costs_sorted[0]:
+            break
+        affordable = np.searchsorted(costs_sorted, budget, side='right')
+        i = unit_rand[j] % affordable
+        unit_cost = costs_sorted[i]
+        total_units = int(count_rand[j] * (budget // unit_cost)) + 1
+        counts[i] += total_units
+        budget -= total_units * unit_cost
+        spent += total_units * unit_cost
+
+    return spent
+
+
+@njit(cache=True)
+def _simulate_team(
+        costs_sorted: np.ndarray,
+        budget: int,
+        unit_rand: np.ndarray,
+        count_rand: np.ndarray,
+    ) -> Tuple[np.ndarray, int]:
+    """
+    Runs _simulate_team_into for a single team with a new counts array.
+
+    Args:
+        costs_sorted (np.ndarray): Unit costs sorted from cheapest to most expensive
+        budget (int): The amount of money the team has to spend
+        unit_rand (np.ndarray): Random non-negative integers used to pick each unit
+        count_rand (np.ndarray): Random floats in [0, 1) used to pick how many of each unit
+
+    Returns:
+        np.ndarray: Count of each unit in the team
+        int: The total cost of the units
+    """
+    counts = np.zeros(costs_sorted.size, dtype=np.int64)
+    spent = _simulate_team_into(costs_sorted, budget, unit_rand, count_rand, counts)
+
+    return counts, spent
+
+
+@njit(parallel=True, nogil=True, cache=True)
+def _simulate_all(
+        costs_sorted: np.ndarray,
+        budget: int,
+        active: np.ndarray,
+        unit_rand: np.ndarray,
+        count_rand: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Runs _simulate_team_into for every team, with the teams spread across the CPU cores.
+    The random draws are made beforehand, so no random state is shared between threads.
+
+    Args:
+        costs_sorted (np.ndarray): Unit costs sorted from cheapest to most expensive
+        budget (int): The amount of money each team has to spend
+        active (np.ndarray): Boolean value per team for if it picks units, False for hobbit only teams
+        unit_rand (np.ndarray): Random non-negative integers used to pick each unit, one row per team
+        count_rand (np.ndarray): Random floats in [0, 1) used to pick how many of each unit, one row per team
+
+    Returns:
+        np.ndarray: Count of each unit per team
+        np.ndarray: The total cost of the units of each team
+    """
+    teams_created = unit_rand.shape[0]
+    counts = np.zeros((teams_created, costs_sorted.size), dtype=np.int64)
+    spent = np.zeros(teams_created, dtype=np.int64)
+
+    for t in prange(teams_created):
+        if active[t]:
+            spent[t] = _simulate_team_into(costs_sorted, budget, unit_rand[t], count_rand[t], counts[t])
+
+    return counts, spent
+
+
+def simulate_teams(
+        costs_sorted: np.ndarray,
+        budget: int,
+        hobbit_team_chance: int,
+        max_unit_width: int,
+        teams_created: int,
+        rng: np.random.Generator,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Runs the unit selection of RandomTabsTeam.generate_team for many teams at once.
+    With Numba, batches of at least NUMBA_BATCH_MIN_TEAMS teams are run in parallel by _simulate_all.
+    Otherwise each distinct unit slot is one NumPy step over every team, so the Python loop is only
+    max_unit_width long.
+    Hobbit fill is left to the caller.
+
+    Args:
+        costs_sorted (np.ndarray): Unit costs sorted from cheapest to most expensive
+        budget (int): The amount of money each team has to spend
+        hobbit_team_chance (int): a 1 out of integer chance of a team just being hobbits
+        max_unit_width (int): the max size of distinct units in a team
+        teams_created (int): The number of teams to simulate
+        rng (np.random.Generator): Random generator used for every draw
+
+    Returns:
+        np.ndarray: Count of each unit per team, shaped (teams_created, number of units)
+        np.ndarray: The budget each team has left
+    """
+    # Hobbit only teams never pick a unit, so they keep their whole budget for the fill
+    active, unit_rand, count_rand = draw_team_randoms(rng, teams_created, hobbit_team_chance, max_unit_width)
+
+    if numba_available and teams_created >= NUMBA_BATCH_MIN_TEAMS:
+        counts, spent = _simulate_all(costs_sorted, budget, active, unit_rand, count_rand)
+        return counts, budget - spent
+
+    budgets = np.full(teams_created, budget, dtype=np.int64)
+    counts = np.zeros((teams_created, costs_sorted.size), dtype=np.int64)
+    teams = np.arange(teams_created)
+
+    for j in range(max_unit_width):
+        affordable = np.searchsorted(costs_sorted, budgets, side='right')
+        active &= affordable > 0
+        if not active.any():
+            break
+        # Teams that can't afford anything still pick a unit to keep the arrays aligned, but add none of it
+        unit = unit_rand[:, j] % np.maximum(affordable, 1)
+        unit_cost = costs_sorted[unit]
+        total_units = (count_rand[:, j] * (budgets // unit_cost)).astype(np.int64) + 1
+        total_units[~active] = 0
+        counts[teams, unit] += total_units
+        budgets -= total_units * unit_cost
+
+    return counts, budgets
+
+
+# Matches strings of only digits, including the empty string
+NUMBER_INPUT_MATCH = re.compile(r'\d*').fullmatch
 
 
 def is_number_input(s) -> bool:
@@ -206,14 +529,15 @@ def is_number_input(s) -> bool:
     Returns:
         bool: True if the string is a digit or empty, False otherwise.
     """
-    return s.isdigit() or s == ''
+    return NUMBER_INPUT_MATCH(s) is not None
 
 
 def update_config() -> None:
     """
-    Updates the currently selected options, and saves them back to the Config.json file
+    Updates the currently selected options, and saves them back to the Config.json file if they have changed.
+    The file is written to a temporary file first and then replaced, so it can't be left half written.
     """
-    global hobbit_fill, hobbit_team_chance, budget, max_unit_width, teams_created, team_difficulty, root
+    global hobbit_fill, hobbit_team_chance, budget, max_unit_width, teams_created, team_difficulty, root, saved_config
     hobbit_fill = bool(root.checkbutton_vars['Hobbit Fill'].get())
     hobbit_team_chance = int(root.settings_entries['Full Hobbit Team Chance'].get())
     budget = int(root.settings_entries['Team Budget'].get())
@@ -229,39 +553,80 @@ def update_config() -> None:
     config["width"] = app_width
     config["height"] = app_height
     config["application_mode"] = app_mode
-    with open('Config.json', 'w') as f:
-        json.dump(config, f, indent=4)
-
-
-def filter_df_difficulty(df: pd.DataFrame, difficulty: int) -> pd.DataFrame:
+    if config == saved_config:
+        return
+
+    # Temporary files are only readable by their owner, so keep the mode of the current Config File
+    try:
+        mode = stat.S_IMODE(os.stat('Config.json').st_mode)
+    except OSError:
+        mode = 0o644
+
+    with tempfile.NamedTemporaryFile('w', dir='.', suffix='.json', delete=False) as f:
+        try:
+            json.dump(config, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        except BaseException:
+            f.close()
+            os.unlink(f.name)
+            raise
+    try:
+        os.chmod(f.name, mode)
+        os.replace(f.name, 'Config.json')
+    except BaseException:
+        os.unlink(f.name)
+        raise
+    saved_config = dict(config)
+
+
+def filter_df_difficulty(difficulty: int) -> np.ndarray:
     """
-    Creates a subsection of the provided Dataframe, filtered by the difficulty level.
-    Note that the max difficulty is 4.
+    Looks up the units that are at or above the difficulty level.
+    Note that the max difficulty is 4, and that a difficulty without any units is also an error.
     
     Args:
-        df (pd.Dataframe): the unit Dataframe to be filtered
         difficulty (int): the difficulty to be filtered to
 
     Returns:
-        pd.Dataframe: the filtered Dataframe
+        np.ndarray: Indices of the units in the difficulty, ordered by cost
     """
     
     if difficulty > 4:
         raise ValueError(f"Unable to set difficulty to higher than 4. Provided value is {difficulty}")
     
-    filtered_df = df[df["Ranking"] >= difficulty]
-    return filtered_df
+    selection = DIFF_INDEX[difficulty]
+    if selection.size == 0:
+        raise ValueError(f"No units are available at difficulty {difficulty}")
+
+    return selection
 
 
 def on_resize(event) -> None:
     """
     When resizing the window, automatically update the width and height variables.
+    Tk sends an event for every step of a resize, so the update is delayed until the events stop.
     This is ignored if the application is closing.
     """
-    global app_width, app_height, closing
+    global resize_after_id
     if not closing:
-        app_width = event.width
-        app_height = event.height
+        if resize_after_id is not None:
+            root.after_cancel(resize_after_id)
+        resize_after_id = root.after(100, commit_resize, event.width, event.height)
+
+
+def commit_resize(width: int, height: int) -> None:
+    """
+    Updates the width and height variables once a resize has finished.
+
+    Args:
+        width (int): The width of the application in pixels
+        height (int): The height of the application in pixels
+    """
+    global app_width, app_height, resize_after_id
+    resize_after_id = None
+    app_width = width
+    app_height = height
 
 
 def on_close() -> None:
@@ -270,6 +635,9 @@ def on_close() -> None:
     """
     global closing
     closing = True
+    if resize_after_id is not None:
+        root.after_cancel(resize_after_id)
+        commit_resize(root.winfo_width(), root.winfo_height())
     update_config()
     root.destroy()
 
@@ -285,11 +653,10 @@ def add_settings_int_box(name: str, row: int, column: int, root: CustomTk, value
         root (CustomTK): Which application the UI is being added to
         value (int): Current value the entry box is set to
     """
-    validate_command = root.register(lambda s: is_number_input(s))
     label = tk.Label(root, text=name)
     label.grid(row=row, column=column)
     root.label_entries[name] = label
-    entry = tk.Entry(root, validate='key', validatecommand=(validate_command, '%S'))
+    entry = tk.Entry(root, validate='key', validatecommand=(root.number_validate_command, '%S'))
     entry.insert(0, value)
     entry.grid(row=row, column=column+1)
     root.settings_entries[name] = entry
@@ -313,6 +680,9 @@ def new_main_application_window(width: int, height: int, mode: str) -> CustomTk:
     geo_size = f"{width}x{height}"
     root.geometry(geo_size)
 
+    # Tcl command for validating the integer entry boxes, shared by all of them
+    root.number_validate_command = root.register(is_number_input)
+
     root.bind('<Configure>', on_resize)
     root.protocol("WM_DELETE_WINDOW", on_close)
 
@@ -359,6 +729,7 @@ def new_main_application_window(width: int, height: int, mode: str) -> CustomTk:
     i += 1
 
     root.set_app_mode(colour)
+    set_notebook_theme(colour)
 
     return root
 
@@ -381,34 +752,33 @@ def generate_tabs_teams() -> dict:
     Returns:
         dict: Dictionary containing all the generated teams
     """
-    teams = []
-    filtered_unit_df = filter_df_difficulty(unit_df, team_difficulty)
-
-    for _ in range(teams_created):
-        team = RandomTabsTeam(budget, filtered_unit_df, hobbit_fill, hobbit_team_chance, max_unit_width)
-        teams.append(team)
+    selection = filter_df_difficulty(team_difficulty)
 
-    return teams
+    return RandomTabsTeam.generate_batch(
+        teams_created,
+        budget,
+        UNIT_KEYS[selection],
+        UNIT_COSTS[selection],
+        hobbit_fill,
+        hobbit_team_chance,
+        max_unit_width,
+    )
 
 
-def show_teams_in_notebook(teams: dict, colour_mode: dict) -> None:
+def set_notebook_theme(colour_mode: dict) -> None:
     """
-    This function shows the generated teams in a new notebook window
-    
+    Creates or updates the ttk theme used by the generated teams notebook, and switches to it.
+    This only needs to be called when the window is made or the colour palette changes.
+
     Args:
-        teams (dict): Dictionary containing generated teams to display in tabbed windows
-        colour (dict): Dictionary of colour palette to be used for the window
+        colour_mode (dict): Dictionary of colour palette to be used for the notebook
     """
-    notebook_window = tk.Toplevel(root)
-    notebook_window.title("Generated Teams")
-
     style = ttk.Style()
-    style_name = 'CustomNotebook'
     
-    if style_name not in style.theme_names():
-        style.theme_create(style_name, parent="alt")
+    if NOTEBOOK_STYLE_NAME not in style.theme_names():
+        style.theme_create(NOTEBOOK_STYLE_NAME, parent="alt")
 
-    style.theme_settings(style_name, settings={
+    style.theme_settings(NOTEBOOK_STYLE_NAME, settings={
         ".": {
             "configure": {
                 "background": colour_mode["background"],
@@ -433,7 +803,19 @@ def show_teams_in_notebook(teams: dict, colour_mode: dict) -> None:
             }
         }
     })
-    style.theme_use(style_name)
+    style.theme_use(NOTEBOOK_STYLE_NAME)
+
+
+def show_teams_in_notebook(teams: dict, colour_mode: dict) -> None:
+    """
+    This function shows the generated teams in a new notebook window, styled by the theme from set_notebook_theme
+    
+    Args:
+        teams (dict): Dictionary containing generated teams to display in tabbed windows
+        colour (dict): Dictionary of colour palette to be used for the window
+    """
+    notebook_window = tk.Toplevel(root)
+    notebook_window.title("Generated Teams")
 
     notebook = ttk.Notebook(notebook_window)
 
@@ -479,6 +861,7 @@ def switch_mode(mode: str) -> None:
     app_mode = mode
     colour = get_mode_colours(mode)
     root.set_app_mode(colour)
+    set_notebook_theme(colour)
 
 def main():
     """